@@ -36,11 +36,14 @@ def create_app_instance():
         
         # Shutdown
         scheduler.running = False
-        scheduler.scheduler_running = False
+        scheduler.stop_scheduler()
         
         # Close all chat sessions
         for session_id in list(scheduler.chat_sessions.keys()):
             await scheduler.close_chat_session(session_id)
+        
+        # Close the HTTP connection pool shared by the chat sessions
+        await scheduler.close_http_session()
     
     # Create FastAPI app
     app = create_app(scheduler, chat_manager)
@@ -80,11 +83,14 @@ def main():
         
         # Shutdown
         scheduler.running = False
-        scheduler.scheduler_running = False
+        scheduler.stop_scheduler()
         
         # Close all chat sessions
         for session_id in list(scheduler.chat_sessions.keys()):
             await scheduler.close_chat_session(session_id)
+        
+        # Close the HTTP connection pool shared by the chat sessions
+        await scheduler.close_http_session()
     
     # Create FastAPI app
     app = create_app(scheduler, chat_manager)
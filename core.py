@@ -3,58 +3,138 @@ Core business logic for the agent system
 """
 
 import asyncio
+import heapq
+import itertools
+import mmap
 import os
+import random
 import re
 import signal
+import threading
+import time
 import uuid
 import aiohttp
-import json
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import logging
 from aiohttp import ClientConnectorError, ClientTimeout, ServerTimeoutError
 
-from models import DEBUG_MODE, get_config
+from models import DEBUG_MODE, ChatMessage, JSONDecodeError, get_config, json_dumps, json_loads
 from monitor import get_task_monitor
 
 logger = logging.getLogger("agent")
 
+# Saved task plan storage (relative to the working directory, like config/config.json)
+TASK_PLANS_PATH = "config/task_plans.json"
+_TASK_PLANS_TMP_PATH = TASK_PLANS_PATH + ".tmp"
+# Plans are machine-written, so they are stored compact unless PRETTY_TASK_PLANS is 1/true/yes
+_PRETTY_TASK_PLANS = os.environ.get("PRETTY_TASK_PLANS", "").strip().lower() in ("1", "true", "yes")
+
+# Longest the scheduler sleeps before re-checking whether it should keep running
+_SCHEDULER_MAX_SLEEP = 60
+# Shift between wall-clock and monotonic time (seconds) treated as a clock jump or system sleep
+_SCHEDULER_CLOCK_JUMP = 1.0
+
+def _monotonic_due(next_run: datetime) -> float:
+    """Monotonic deadline for a naive local wall-clock time (timestamp() accounts for DST)"""
+    return time.monotonic() + (next_run.timestamp() - time.time())
+
+# Interval schedule specs such as 'every 30min' or 'every 2 hours'
+_EVERY_RE = re.compile(r'every\s+(\d+)\s*(min|minutes|hour|hours)')
+
+# Fallback event loop for the synchronous agent_ask wrapper when the app loop is not running (created lazily)
+_bg_loop = None
+_bg_loop_lock = threading.Lock()
+
+def _get_bg_loop():
+    """Get the shared background event loop, starting it on first use"""
+    global _bg_loop
+    if _bg_loop is None:
+        # agent_ask may be called from several threads at once - only one of them starts the loop
+        with _bg_loop_lock:
+            if _bg_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                _bg_loop = loop
+    return _bg_loop
+
+# Chat API base URL resolved once from the environment/config (created lazily)
+_chat_api_url = None
+
+def _get_chat_api_url():
+    """Get the chat API base URL; CHAT_API_BASE_URL overrides chat_api.base_url"""
+    global _chat_api_url
+    if _chat_api_url is None:
+        _chat_api_url = os.environ.get("CHAT_API_BASE_URL") or get_config("chat_api.base_url")
+    return _chat_api_url
+
+# Read size and data-line framing for streamed API responses
+_SSE_CHUNK_SIZE = 64 * 1024
+_SSE_DATA_PREFIX = b"data: "
+_SSE_DATA_PREFIX_LEN = len(_SSE_DATA_PREFIX)
+_SSE_DONE = b"[DONE]"  # End-of-stream sentinel sent by OpenAI-compatible servers
+
+# Fixed parts of the /api/chat request body; only the message itself is encoded per request
+_CHAT_BODY_PREFIX = b'{"messages":[{"role":"user","content":'
+_CHAT_BODY_SUFFIX = b'}],"stream":false}'
+_CHAT_BODY_STREAM_SUFFIX = b'}],"stream":true}'
+
+def _build_chat_body(message: str, stream: bool) -> bytes:
+    """Build the JSON body of a single-message chat request"""
+    return _CHAT_BODY_PREFIX + json_dumps(message) + (_CHAT_BODY_STREAM_SUFFIX if stream else _CHAT_BODY_SUFFIX)
+
+async def _iter_sse_data(response):
+    """Yield the payload bytes of each 'data: ' line in a streamed (SSE) response"""
+    buf = bytearray()
+    async for chunk in response.content.iter_chunked(_SSE_CHUNK_SIZE):
+        buf += chunk
+        start = 0
+        # Split complete lines out of the buffer; the unterminated tail waits for the next chunk.
+        # The in-place prefix test also drops blank lines and ': keep-alive' comments without copying them
+        while (end := buf.find(b"\n", start)) != -1:
+            if buf.startswith(_SSE_DATA_PREFIX, start):
+                # Drop the '\r' of CRLF line endings so payloads compare cleanly
+                line_end = end - 1 if buf[end - 1] == 0x0D else end
+                yield bytes(buf[start + _SSE_DATA_PREFIX_LEN:line_end])
+            start = end + 1
+        del buf[:start]
+    if buf.startswith(_SSE_DATA_PREFIX):
+        yield bytes(buf[_SSE_DATA_PREFIX_LEN:]).rstrip(b"\r")
+
 class ChatSession:
     """Manages individual chat session via HTTP API communication"""
     
-    def __init__(self, session_id: str, debug_mode: bool = False, api_session_id: str = None):
+    def __init__(self, session_id: str, debug_mode: bool = False, api_session_id: str = None,
+                 http_session_provider=None):
         self.session_id = session_id
         self.api_session_id = api_session_id or str(uuid.uuid4())  # Use provided ID or generate new
+        # One request at a time: /api/chat keeps conversation state per X-Session-ID
         self.lock = asyncio.Lock()
         self.debug_mode = debug_mode
         self.http_session = None
-        self.connection_pool_connector = None
+        # Async callable returning the shared HTTP session (owned by TaskScheduler)
+        self.http_session_provider = http_session_provider
         self.retry_count = 0
         self.max_retries = get_config("chat_api.max_retries", 3)
+        # Request endpoint and headers are fixed per session, so they are built once in start()
+        self.endpoint = None
+        self.headers = None
     
     async def start(self):
-        """Start the HTTP session for API communication"""
+        """Attach to the shared HTTP session for API communication"""
         try:
-            # Create connection pool connector for better performance
-            self.connection_pool_connector = aiohttp.TCPConnector(
-                limit=get_config("chat_api.connection_pool_limit", 10),
-                keepalive_timeout=get_config("chat_api.keepalive_timeout", 30),
-                enable_cleanup_closed=True
-            )
+            if self.http_session_provider is None:
+                raise RuntimeError("no HTTP session provider configured")
+            self.http_session = await self.http_session_provider()
             
-            # Create HTTP session with connection pooling
-            timeout = aiohttp.ClientTimeout(
-                total=get_config("timeouts.message_response_timeout"),
-                connect=get_config("timeouts.connect_timeout", 10)
-            )
-            self.http_session = aiohttp.ClientSession(
-                timeout=timeout,
-                connector=self.connection_pool_connector
-            )
+            # Prepare API request target - use environment variable or config
+            api_url = _get_chat_api_url()
+            self.endpoint = f"{api_url}/api/chat"
+            self.headers = self._build_api_headers()
             
-            # HTTP session created successfully
+            # HTTP session attached successfully
             if self.debug_mode:
-                api_url = os.environ.get("CHAT_API_BASE_URL", get_config("chat_api.base_url"))
                 logger.debug(f"Chat session {self.session_id} HTTP session ready for API: {api_url}")
             return True
                 
@@ -62,8 +142,8 @@ class ChatSession:
             logger.error(f"Failed to create chat session {self.session_id}: {e}")
             return False
     
-    async def _get_api_headers(self):
-        """Get headers for API requests"""
+    def _build_api_headers(self):
+        """Build headers for API requests"""
         headers = {
             "Content-Type": "application/json",
             "X-Session-ID": self.api_session_id
@@ -89,35 +169,33 @@ class ChatSession:
             else:
                 return await self._send_message_with_retry(message)
     
-    async def _send_message_with_retry(self, message: str, attempt: int = 0) -> str:
+    async def _send_message_with_retry(self, message: str, attempt: int = 0, body: bytes = None) -> str:
         """Internal method to send message with retry logic"""
         try:
+            # Build the request body once and reuse it across retry attempts (non-streaming mode).
+            # Inside the try so a message the JSON backend refuses to encode becomes an error reply
+            if body is None:
+                body = _build_chat_body(message, stream=False)
+            
             if not self.http_session:
                 # Attempt to restart session once
                 if attempt == 0:
                     success = await self.start()
                     if success:
-                        return await self._send_message_with_retry(message, attempt + 1)
+                        return await self._send_message_with_retry(message, attempt + 1, body)
                 return f"Error: No HTTP session available for {self.session_id}"
             
-            # Prepare API request - use environment variable or config
-            api_url = os.environ.get("CHAT_API_BASE_URL", get_config("chat_api.base_url"))
-            endpoint = f"{api_url}/api/chat"
-            
-            headers = await self._get_api_headers()
-            
-            payload = {
-                "messages": [{"role": "user", "content": message}],
-                "stream": False  # Non-streaming mode
-            }
+            endpoint = self.endpoint
+            headers = self.headers
             
             if self.debug_mode:
                 logger.debug(f"Session {self.session_id} API request: {endpoint} (attempt {attempt + 1})")
             
-            async with self.http_session.post(endpoint, headers=headers, json=payload) as response:
+            # Body is pre-encoded JSON (Content-Type is already set in the headers)
+            async with self.http_session.post(endpoint, headers=headers, data=body) as response:
                 if response.status == 200:
                     try:
-                        result = await response.json()
+                        result = json_loads(await response.read())
                         # Extract content from OpenAI-compatible response
                         if "choices" in result and result["choices"]:
                             content = result["choices"][0]["message"]["content"]
@@ -127,26 +205,27 @@ class ChatSession:
                         else:
                             logger.warning(f"Unexpected API response format: {result}")
                             return "Error: Unexpected API response format - no choices found"
-                    except json.JSONDecodeError as e:
+                    except JSONDecodeError as e:
                         logger.error(f"Failed to parse JSON response: {e}")
                         return "Error: Invalid JSON response from chat service"
                 
                 elif response.status == 429:
                     # Rate limit - wait and retry
                     if attempt < self.max_retries:
-                        wait_time = min(2 ** attempt, 60)  # Exponential backoff, max 60s
-                        logger.warning(f"Rate limited, waiting {wait_time}s before retry (attempt {attempt + 1})")
+                        # Exponential backoff with full jitter, max 60s - spreads retries from concurrent sessions
+                        wait_time = random.uniform(0, min(2 ** attempt, 60))
+                        logger.warning(f"Rate limited, waiting {wait_time:.1f}s before retry (attempt {attempt + 1})")
                         await asyncio.sleep(wait_time)
-                        return await self._send_message_with_retry(message, attempt + 1)
+                        return await self._send_message_with_retry(message, attempt + 1, body)
                     return "Error: Chat service rate limit exceeded, please try again later"
                 
                 elif response.status in [500, 502, 503, 504]:
                     # Server errors - retry with backoff
                     if attempt < self.max_retries:
-                        wait_time = min(2 ** attempt, 30)  # Exponential backoff, max 30s
-                        logger.warning(f"Server error {response.status}, retrying in {wait_time}s (attempt {attempt + 1})")
+                        wait_time = random.uniform(0, min(2 ** attempt, 30))  # Jittered backoff, max 30s
+                        logger.warning(f"Server error {response.status}, retrying in {wait_time:.1f}s (attempt {attempt + 1})")
                         await asyncio.sleep(wait_time)
-                        return await self._send_message_with_retry(message, attempt + 1)
+                        return await self._send_message_with_retry(message, attempt + 1, body)
                     error_text = await response.text()
                     return f"Error: Chat service unavailable after {self.max_retries} retries ({response.status}): {error_text[:200]}"
                 
@@ -168,19 +247,19 @@ class ChatSession:
                 logger.info(f"Attempting to restart HTTP session for {self.session_id}")
                 success = await self.restart_process()
                 if success:
-                    return await self._send_message_with_retry(message, attempt + 1)
+                    return await self._send_message_with_retry(message, attempt + 1, body)
             return f"Error: Cannot connect to chat service - {str(e)[:100]}"
         
         except (asyncio.TimeoutError, ServerTimeoutError):
             if attempt < self.max_retries:
-                wait_time = min(2 ** attempt, 15)  # Shorter backoff for timeouts
-                logger.warning(f"Timeout in API request for session {self.session_id}, retrying in {wait_time}s (attempt {attempt + 1})")
+                wait_time = random.uniform(0, min(2 ** attempt, 15))  # Shorter jittered backoff for timeouts
+                logger.warning(f"Timeout in API request for session {self.session_id}, retrying in {wait_time:.1f}s (attempt {attempt + 1})")
                 await asyncio.sleep(wait_time)
-                return await self._send_message_with_retry(message, attempt + 1)
+                return await self._send_message_with_retry(message, attempt + 1, body)
             logger.warning(f"Timeout in API request for session {self.session_id} after {self.max_retries} retries")
             return f"Error: Request timeout after {self.max_retries} retries - chat service may be overloaded"
         
-        except json.JSONDecodeError as e:
+        except JSONDecodeError as e:
             logger.error(f"JSON decode error for session {self.session_id}: {e}")
             return "Error: Invalid response format from chat service"
         
@@ -196,52 +275,46 @@ class ChatSession:
                 if not success:
                     return f"Error: No HTTP session available for {self.session_id}"
             
-            # Prepare API request for streaming
-            api_url = os.environ.get("CHAT_API_BASE_URL", get_config("chat_api.base_url"))
-            endpoint = f"{api_url}/api/chat"
+            endpoint = self.endpoint
+            headers = self.headers
             
-            headers = await self._get_api_headers()
-            
-            payload = {
-                "messages": [{"role": "user", "content": message}],
-                "stream": True  # Enable streaming
-            }
+            body = _build_chat_body(message, stream=True)  # Enable streaming
             
             if self.debug_mode:
                 logger.debug(f"Session {self.session_id} streaming request: {endpoint}")
             
-            full_response = ""
+            # Collect content chunks and join once at the end
+            response_parts = []
             
-            async with self.http_session.post(endpoint, headers=headers, json=payload) as response:
+            async with self.http_session.post(endpoint, headers=headers, data=body) as response:
                 if response.status == 200:
                     # Process streaming response from external API
-                    async for line in response.content:
-                        if line:
-                            decoded = line.decode('utf-8').strip()
-                            if decoded.startswith('data: '):
-                                try:
-                                    data = json.loads(decoded[6:])  # Skip 'data: ' prefix
-                                    
-                                    if 'choices' in data and data['choices']:
-                                        delta = data['choices'][0].get('delta', {})
-                                        content = delta.get('content', '')
-                                        
-                                        if content:
-                                            full_response += content
-                                            # Send chunk to callback for real-time display
-                                            if stream_callback:
-                                                await stream_callback(content)
-                                    
-                                    # Check if stream is done
-                                    if 'choices' in data and data['choices']:
-                                        if data['choices'][0].get('finish_reason'):
-                                            break
-                                            
-                                except json.JSONDecodeError:
-                                    # Skip non-JSON lines from streaming response
-                                    pass
+                    async for data_line in _iter_sse_data(response):
+                        # Recognize the end-of-stream sentinel and empty frames without a JSON parse attempt
+                        if data_line == _SSE_DONE:
+                            break
+                        if not data_line:
+                            continue
+                        try:
+                            data = json_loads(data_line)
+                        except JSONDecodeError:
+                            # Skip non-JSON lines from streaming response
+                            continue
+                        
+                        if 'choices' in data and data['choices']:
+                            choice = data['choices'][0]
+                            content = choice.get('delta', {}).get('content', '')
+                            
+                            if content:
+                                response_parts.append(content)
+                                # Send chunk to callback for real-time display (send_message only streams with one)
+                                await stream_callback(content)
+                            
+                            # Check if stream is done
+                            if choice.get('finish_reason'):
+                                break
                     
-                    return full_response.strip() if full_response else "(No response content)"
+                    return "".join(response_parts).strip() or "(No response content)"
                     
                 else:
                     error_text = await response.text()
@@ -254,30 +327,15 @@ class ChatSession:
     
     async def restart_process(self):
         """Restart the HTTP session"""
-        # Close existing session
+        # Drop the current reference and re-attach (the provider recreates the session if it was closed)
         await self.close()
-        
-        # Create new HTTP session
         return await self.start()
 
     async def close(self):
-        """Close the HTTP session and connection pool"""
+        """Release the HTTP session (the shared session itself is closed by TaskScheduler)"""
         if self.http_session:
-            try:
-                await self.http_session.close()
-                logger.info(f"Chat session {self.session_id} HTTP session closed")
-            except Exception as e:
-                logger.error(f"Error closing HTTP session {self.session_id}: {e}")
-            finally:
-                self.http_session = None
-        
-        if self.connection_pool_connector:
-            try:
-                await self.connection_pool_connector.close()
-            except Exception as e:
-                logger.error(f"Error closing connection pool for {self.session_id}: {e}")
-            finally:
-                self.connection_pool_connector = None
+            self.http_session = None
+            logger.info(f"Chat session {self.session_id} HTTP session released")
 
 class TaskScheduler:
     """Manages scheduled tasks and chat sessions"""
@@ -289,11 +347,51 @@ class TaskScheduler:
         self.task_queue = None  # Initialize later when event loop is ready
         self.debug_mode = DEBUG_MODE
         self.scheduled_tasks = {}  # Dictionary: session_id -> [tasks]
+        self._total_tasks = 0  # Running count of tasks across all sessions
+        self._schedule_heap = []  # Min-heap of (next_run_monotonic, task_id, task) consumed by run_scheduler
+        self._live_tasks: Dict[int, dict] = {}  # Dictionary: task_id -> task, for tasks still scheduled
+        self._task_ids = itertools.count()
+        self._schedule_wakeup = asyncio.Event()  # Set when tasks are registered so run_scheduler re-checks the heap
         self.active_plans = {}  # Dictionary: session_id -> plan_name
-        # No longer tracking plan_usage - we scan active_plans in real-time instead
+        self.plan_usage_count: Dict[str, int] = {}  # Dictionary: plan_name -> number of sessions using it
         self.scheduler_running = False
         self.chat_manager_ref: Any = None  # Reference to ChatManager for broadcasting
         self.task_monitor = get_task_monitor()  # Task monitoring instance
+        self._plans_cache = None  # Parsed task_plans.json: plan_name -> plan_data
+        self._plans_mtime = 0  # st_mtime_ns of task_plans.json when it was cached
+        self._plan_summary_cache = {}  # Dictionary: plan_name -> {created_at, task_count}
+        self._http_session: Optional[aiohttp.ClientSession] = None  # Shared by all chat sessions
+        self._main_loop: Optional[asyncio.AbstractEventLoop] = None  # Loop running the task queue
+        self._session_backlogs: Dict[str, deque] = {}  # Dictionary: session_id -> tasks waiting behind the one running
+        
+    async def ensure_http_session(self) -> aiohttp.ClientSession:
+        """Get the HTTP session shared by all chat sessions, creating it on first use"""
+        if self._http_session is None or self._http_session.closed:
+            # One connection pool and DNS cache for every session, so keep-alive connections are reused
+            connector = aiohttp.TCPConnector(
+                limit=get_config("chat_api.connection_pool_limit", 100),
+                limit_per_host=get_config("chat_api.connection_pool_limit_per_host", 0),
+                ttl_dns_cache=get_config("chat_api.dns_cache_ttl", 600),
+                keepalive_timeout=get_config("chat_api.keepalive_timeout", 60),
+                enable_cleanup_closed=True
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=get_config("timeouts.message_response_timeout"),
+                connect=get_config("timeouts.connect_timeout", 10)
+            )
+            self._http_session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+        return self._http_session
+    
+    async def close_http_session(self):
+        """Close the shared HTTP session and its connection pool"""
+        if self._http_session:
+            try:
+                await self._http_session.close()
+                logger.info("Shared HTTP session closed")
+            except Exception as e:
+                logger.error(f"Error closing shared HTTP session: {e}")
+            finally:
+                self._http_session = None
         
     async def create_chat_session(self, session_id: str):
         """Create a new chat session for a specific session ID"""
@@ -302,7 +400,7 @@ class TaskScheduler:
             
         # Reuse existing API session ID if available, otherwise a new one will be created
         api_session_id = self.api_session_ids.get(session_id)
-        session = ChatSession(session_id, self.debug_mode, api_session_id)
+        session = ChatSession(session_id, self.debug_mode, api_session_id, self.ensure_http_session)
         success = await session.start()
         
         if success:
@@ -328,14 +426,11 @@ class TaskScheduler:
             
             # Clean up scheduled tasks for this session
             if session_id in self.scheduled_tasks:
-                del self.scheduled_tasks[session_id]
+                self._total_tasks -= len(self.scheduled_tasks[session_id])
+                self._unregister_tasks(self.scheduled_tasks.pop(session_id))
             
             # Clean up active plan for this session
-            if session_id in self.active_plans:
-                plan_name = self.active_plans[session_id]
-                del self.active_plans[session_id]
-                
-                # Plan usage is now calculated in real-time by scanning active_plans
+            self._clear_active_plan(session_id)
             
             # Disable task monitoring for this session
             self.task_monitor.disable_monitoring(session_id)
@@ -363,18 +458,25 @@ class TaskScheduler:
     
     def agent_ask(self, session_id: str, question: str):
         """Synchronous wrapper for compatibility"""
-        loop = asyncio.new_event_loop()
+        # Run on the app's loop so the request reuses the shared HTTP session and its connection pool
+        loop = self._main_loop
+        if loop is None or not loop.is_running():
+            loop = _get_bg_loop()
         try:
-            return loop.run_until_complete(self.send_message(session_id, question))
-        finally:
-            loop.close()
+            calling_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            calling_loop = None
+        if calling_loop is loop:
+            raise RuntimeError("agent_ask would block its own event loop - use agent_ask_async instead")
+        future = asyncio.run_coroutine_threadsafe(self.send_message(session_id, question), loop)
+        return future.result()
     
     def parse_schedule_time(self, time_str):
         """Parse time string like '10:30', '2:15pm', 'daily 9:00', 'every 30min'"""
         time_str = time_str.lower().strip()
         
-        if time_str.startswith('every ') and ('min' in time_str or 'hour' in time_str):
-            match = re.search(r'every\s+(\d+)\s*(min|minutes|hour|hours)', time_str)
+        if time_str.startswith('every '):
+            match = _EVERY_RE.match(time_str)
             if match:
                 value = int(match.group(1))
                 unit = match.group(2)
@@ -416,6 +518,41 @@ class TaskScheduler:
             
         return datetime.now().replace(hour=hour, minute=minute, second=0, microsecond=0)
     
+    def _build_scheduled_task(self, session_id: str, message: str, schedule_spec: str, parsed):
+        """Build a task record for a parsed schedule without registering it"""
+        task_info = {
+            'session_id': session_id,
+            'message': message,
+            'schedule_spec': schedule_spec,
+            'parsed': parsed,
+            'last_run': None,
+            'is_running': False
+        }
+        
+        now = datetime.now()
+        if parsed[0] == 'interval':
+            value, unit = parsed[1], parsed[2]
+            if unit == 'min':
+                task_info['interval_seconds'] = value * 60
+            else:
+                task_info['interval_seconds'] = value * 3600
+            task_info['next_run'] = now + timedelta(seconds=task_info['interval_seconds'])
+        else:
+            time_str = parsed[1]
+            target_time = self.parse_time_string(time_str)
+            if target_time <= now:
+                target_time += timedelta(days=1)
+            task_info['next_run'] = target_time
+        
+        # The scheduler heap is keyed on monotonic times; next_run stays the wall-clock time that decides when it fires
+        task_info['next_run_monotonic'] = _monotonic_due(task_info['next_run'])
+        
+        # Cache ISO strings so task listings don't reformat on every poll
+        task_info['next_run_iso'] = task_info['next_run'].isoformat()
+        task_info['last_run_iso'] = None
+        
+        return task_info
+    
     def schedule_task(self, session_id: str, message: str, schedule_spec: str):
         """Schedule a message to be sent at specified time for specific session"""
         parsed = self.parse_schedule_time(schedule_spec)
@@ -428,35 +565,52 @@ class TaskScheduler:
             self.scheduled_tasks[session_id] = []
         
         try:
-            task_info = {
-                'session_id': session_id,
-                'message': message,
-                'schedule_spec': schedule_spec,
-                'parsed': parsed,
-                'last_run': None,
-                'is_running': False
-            }
-            
-            if parsed[0] == 'interval':
-                value, unit = parsed[1], parsed[2]
-                if unit == 'min':
-                    task_info['interval_seconds'] = value * 60
-                else:
-                    task_info['interval_seconds'] = value * 3600
-                task_info['next_run'] = datetime.now() + timedelta(seconds=task_info['interval_seconds'])
-            else:
-                time_str = parsed[1]
-                target_time = self.parse_time_string(time_str)
-                if target_time <= datetime.now():
-                    target_time += timedelta(days=1)
-                task_info['next_run'] = target_time
-            
-            self.scheduled_tasks[session_id].append(task_info)
-            truncate_len = get_config("limits.message_truncation_length")
-            return True, f"Scheduled for session {session_id}: '{message}' at {schedule_spec}"
-            
+            task_info = self._build_scheduled_task(session_id, message, schedule_spec, parsed)
         except Exception as e:
             return False, f"Error scheduling: {e}"
+        
+        self.scheduled_tasks[session_id].append(task_info)
+        self._total_tasks += 1
+        self._register_tasks((task_info,))
+        return True, f"Scheduled for session {session_id}: '{message}' at {schedule_spec}"
+    
+    def _build_scheduled_tasks(self, session_id: str, tasks):
+        """Build task records for many {message, schedule_spec} tasks, skipping invalid entries"""
+        records = []
+        parse = self.parse_schedule_time
+        build = self._build_scheduled_task
+        for task in tasks:
+            # Read each field once; plan tasks are plain dicts straight from the plans file
+            message, schedule_spec = task["message"], task["schedule_spec"]
+            parsed = parse(schedule_spec)
+            if not parsed:
+                continue
+            try:
+                records.append(build(session_id, message, schedule_spec, parsed))
+            except Exception as e:
+                logger.warning(f"Skipping task with schedule '{schedule_spec}': {e}")
+        return records
+    
+    def _register_tasks(self, tasks):
+        """Track newly scheduled tasks and queue their first run for run_scheduler"""
+        heap = self._schedule_heap
+        for task in tasks:
+            task_id = next(self._task_ids)
+            task['task_id'] = task_id
+            self._live_tasks[task_id] = task
+            heapq.heappush(heap, (task['next_run_monotonic'], task_id, task))
+        self._schedule_wakeup.set()
+    
+    def _unregister_tasks(self, tasks):
+        """Stop tracking removed tasks; their heap entries are discarded when they come due"""
+        for task in tasks:
+            self._live_tasks.pop(task['task_id'], None)
+        
+        # Compact the heap if removed tasks make up most of it
+        if len(self._schedule_heap) > 2 * len(self._live_tasks) + 64:
+            live = self._live_tasks
+            self._schedule_heap = [entry for entry in self._schedule_heap if live.get(entry[1]) is entry[2]]
+            heapq.heapify(self._schedule_heap)
     
     async def scheduled_message_for_session(self, session_id, message):
         """Queue scheduled message for execution for specific session"""
@@ -464,95 +618,168 @@ class TaskScheduler:
             await self.task_queue.put(('scheduled', session_id, message))
     
     async def process_task_queue(self):
-        """Process queued tasks one by one"""
+        """Process queued tasks with a pool of concurrent workers"""
         # Initialize the task queue in the correct event loop
         if self.task_queue is None:
             self.task_queue = asyncio.Queue()
-            
+        self._main_loop = asyncio.get_running_loop()
+        
+        # Sessions are independent, so workers run different sessions' tasks concurrently;
+        # tasks for the same session still run one at a time in queue order
+        worker_count = max(1, get_config("scheduler.workers", 8))
+        await asyncio.gather(*(self._task_queue_worker() for _ in range(worker_count)))
+    
+    async def _task_queue_worker(self):
+        """Take tasks off the shared queue until the scheduler stops running"""
+        # Poll timeout bounds how long shutdown waits for the loop to notice running=False
+        queue_timeout = get_config("timeouts.task_queue_timeout")
+        truncate_len = get_config("limits.message_truncation_length")
+        
         while self.running:
             try:
                 # Wait for a task with timeout to prevent blocking
-                queue_timeout = get_config("timeouts.task_queue_timeout")
                 task = await asyncio.wait_for(self.task_queue.get(), timeout=queue_timeout)
-                task_type, session_id, message = task
-                
-                if task_type == 'scheduled':
-                    # Same logic as /web/chat endpoint
-                    if hasattr(self, 'chat_manager_ref') and self.chat_manager_ref:
-                        from datetime import datetime
-                        from models import ChatMessage
-                        
-                        # 1. Store user message (same as /web/chat)
-                        user_msg = ChatMessage(
-                            message=f"[AGENT] {message}",
-                            sender="user", 
-                            timestamp=datetime.now().isoformat()
-                        )
-                        if session_id not in self.chat_manager_ref.chat_history:
-                            self.chat_manager_ref.chat_history[session_id] = []
-                        self.chat_manager_ref.chat_history[session_id].append(user_msg)
-                        
-                        # 2. Get AI response (same as /web/chat)
-                        response = await self.chat_manager_ref.ask_ai(session_id, message)
-                        
-                        # 3. Store AI response (same as /web/chat) 
-                        if response and response.strip():
-                            ai_msg = ChatMessage(
-                                message=response,
-                                sender="assistant",
-                                timestamp=datetime.now().isoformat()
-                            )
-                            self.chat_manager_ref.chat_history[session_id].append(ai_msg)
-                            
-                            # 4. Trigger SSE broadcast (what manual messages do)
-                            # The SSE polling will detect these new messages and send them
-                            truncate_len = get_config("limits.message_truncation_length")
-                            logger.info(f"Scheduled AI response stored for session {session_id}: {response[:truncate_len]}...")
-                            
-                            await self.task_monitor.monitor_scheduled_response(
-                                session_id, message, response, scheduler_ref=self
-                            )
-                
-                self.task_queue.task_done()
-                    
             except asyncio.TimeoutError:
                 # No task available, continue loop
                 continue
-            except Exception as e:
-                logger.error(f"Task queue error: {e}")
-                try:
-                    if self.task_queue:
-                        self.task_queue.task_done()
-                except:
-                    pass
             
-            await asyncio.sleep(0.01)
+            try:
+                await self._run_session_tasks(task, truncate_len)
+            finally:
+                self.task_queue.task_done()
+    
+    async def _run_session_tasks(self, task, truncate_len):
+        """Run a queued task, then any tasks queued behind it for the same session, in order"""
+        session_id = task[1]
+        backlog = self._session_backlogs.get(session_id)
+        if backlog is not None:
+            # Another worker is running this session's tasks - it picks this one up next
+            backlog.append(task)
+            return
+        
+        backlog = self._session_backlogs[session_id] = deque()
+        try:
+            while True:
+                try:
+                    await self._handle_queued_task(task, truncate_len)
+                except Exception as e:
+                    logger.error(f"Task queue error: {e}")
+                    # Brief pause so a persistent error can't spin the loop
+                    await asyncio.sleep(0.01)
+                if not backlog:
+                    break
+                task = backlog.popleft()
+        finally:
+            del self._session_backlogs[session_id]
+    
+    async def _handle_queued_task(self, task, truncate_len):
+        """Run a single queued task"""
+        task_type, session_id, message = task
+        
+        if task_type == 'scheduled':
+            # Same logic as /web/chat endpoint
+            if hasattr(self, 'chat_manager_ref') and self.chat_manager_ref:
+                # 1. Store user message (same as /web/chat)
+                user_msg = ChatMessage(
+                    message=f"[AGENT] {message}",
+                    sender="user", 
+                    timestamp=datetime.now().isoformat()
+                )
+                self.chat_manager_ref.get_history(session_id).append(user_msg)
+                
+                # 2. Get AI response (same as /web/chat)
+                response = await self.chat_manager_ref.ask_ai(session_id, message)
+                
+                # 3. Store AI response (same as /web/chat) 
+                if response and response.strip():
+                    ai_msg = ChatMessage(
+                        message=response,
+                        sender="assistant",
+                        timestamp=datetime.now().isoformat()
+                    )
+                    self.chat_manager_ref.get_history(session_id).append(ai_msg)
+                    
+                    # 4. Trigger SSE broadcast (what manual messages do)
+                    # The SSE polling will detect these new messages and send them
+                    logger.info(f"Scheduled AI response stored for session {session_id}: {response[:truncate_len]}...")
+                    
+                    await self.task_monitor.monitor_scheduled_response(
+                        session_id, message, response, scheduler_ref=self
+                    )
     
     async def run_scheduler(self):
         """Run the scheduler in background for all sessions"""
         logger.info("Scheduler started")
         
+        clock_offset = time.time() - time.monotonic()
+        
         while self.scheduler_running and self.running:
-            now = datetime.now()
+            now_m = time.monotonic()
             
-            # Check tasks for all sessions
-            for session_id, tasks in self.scheduled_tasks.items():
-                for task in tasks[:]:
-                    if now >= task['next_run'] and not task['is_running']:
-                        task['is_running'] = True
-                        asyncio.create_task(self._execute_scheduled_task(task))
-                        
-                        if task['parsed'][0] == 'interval':
-                            while task['next_run'] <= now:
-                                task['next_run'] += timedelta(seconds=task['interval_seconds'])
-                        else:
-                            task['next_run'] += timedelta(days=1)
-                        
-                        task['last_run'] = now
+            # Monotonic time stops during system sleep and ignores clock changes - re-key the heap if the wall clock jumped
+            offset = time.time() - now_m
+            if abs(offset - clock_offset) > _SCHEDULER_CLOCK_JUMP:
+                clock_offset = offset
+                self._rekey_schedule_heap()
+            heap = self._schedule_heap
+            
+            # Pop only the tasks that are due instead of sweeping every session's task list
+            while heap and heap[0][0] <= now_m:
+                _, task_id, task = heapq.heappop(heap)
+                if self._live_tasks.get(task_id) is not task:
+                    continue  # Task was deleted, cleared or replaced by a plan load
+                
+                if task['is_running']:
+                    # Previous run still in progress - check again on the next tick
+                    heapq.heappush(heap, (now_m + 1, task_id, task))
+                    continue
+                
+                # The wall clock decides; the monotonic key is only an estimate of when that is
+                now = datetime.now()
+                if now < task['next_run']:
+                    task['next_run_monotonic'] = max(_monotonic_due(task['next_run']), now_m + 1)
+                    heapq.heappush(heap, (task['next_run_monotonic'], task_id, task))
+                    continue
+                
+                task['is_running'] = True
+                asyncio.create_task(self._execute_scheduled_task(task))
+                
+                if task['parsed'][0] == 'interval':
+                    while task['next_run'] <= now:
+                        task['next_run'] += timedelta(seconds=task['interval_seconds'])
+                else:
+                    task['next_run'] += timedelta(days=1)
+                
+                task['last_run'] = now
+                task['next_run_iso'] = task['next_run'].isoformat()
+                task['last_run_iso'] = now.isoformat()
+                # Re-derive the monotonic due time from the wall-clock schedule so drift never accumulates
+                task['next_run_monotonic'] = _monotonic_due(task['next_run'])
+                heapq.heappush(heap, (task['next_run_monotonic'], task_id, task))
             
-            await asyncio.sleep(1)
+            # Sleep until the next task is due; registering new tasks wakes the loop early
+            delay = heap[0][0] - time.monotonic() if heap else _SCHEDULER_MAX_SLEEP
+            self._schedule_wakeup.clear()
+            try:
+                await asyncio.wait_for(self._schedule_wakeup.wait(), timeout=min(max(delay, 0), _SCHEDULER_MAX_SLEEP))
+            except asyncio.TimeoutError:
+                pass
         logger.info("Scheduler stopped")
     
+    def _rekey_schedule_heap(self):
+        """Rebuild the scheduler heap with monotonic due times recomputed from each task's wall-clock next_run"""
+        heap = []
+        for task_id, task in self._live_tasks.items():
+            task['next_run_monotonic'] = _monotonic_due(task['next_run'])
+            heap.append((task['next_run_monotonic'], task_id, task))
+        heapq.heapify(heap)
+        self._schedule_heap = heap
+    
+    def stop_scheduler(self):
+        """Ask run_scheduler to exit, waking it if it is sleeping until the next due task"""
+        self.scheduler_running = False
+        self._schedule_wakeup.set()
+    
     async def _execute_scheduled_task(self, task):
         """Execute a scheduled task for specific session and clear the running flag when done"""
         try:
@@ -563,35 +790,26 @@ class TaskScheduler:
         finally:
             task['is_running'] = False
 
+    def _task_snapshot(self, task):
+        """Build the API view of a scheduled task from its cached ISO timestamps"""
+        return {
+            'session_id': task['session_id'],
+            'message': task['message'],
+            'schedule_spec': task['schedule_spec'],
+            'next_run': task['next_run_iso'],
+            'last_run': task['last_run_iso'],
+            'is_running': task['is_running']
+        }
+
     def get_scheduled_tasks(self, session_id=None):
         """Get scheduled tasks for specific session or all sessions"""
-        tasks = []
-        
         if session_id:
             # Get tasks for specific session
-            if session_id in self.scheduled_tasks:
-                for task in self.scheduled_tasks[session_id]:
-                    tasks.append({
-                        'session_id': task['session_id'],
-                        'message': task['message'],
-                        'schedule_spec': task['schedule_spec'],
-                        'next_run': task['next_run'].isoformat(),
-                        'last_run': task['last_run'].isoformat() if task['last_run'] else None,
-                        'is_running': task['is_running']
-                    })
+            task_lists = (self.scheduled_tasks.get(session_id, ()),)
         else:
             # Get tasks for all sessions
-            for session_id, session_tasks in self.scheduled_tasks.items():
-                for task in session_tasks:
-                    tasks.append({
-                        'session_id': task['session_id'],
-                        'message': task['message'],
-                        'schedule_spec': task['schedule_spec'],
-                        'next_run': task['next_run'].isoformat(),
-                        'last_run': task['last_run'].isoformat() if task['last_run'] else None,
-                        'is_running': task['is_running']
-                    })
-        return tasks
+            task_lists = self.scheduled_tasks.values()
+        return [self._task_snapshot(task) for tasks in task_lists for task in tasks]
 
     def clear_scheduled_tasks(self, session_id=None):
         """Clear scheduled tasks for specific session or all sessions"""
@@ -601,32 +819,27 @@ class TaskScheduler:
             # Clear tasks for specific session
             if session_id in self.scheduled_tasks:
                 count = len(self.scheduled_tasks[session_id])
+                self._unregister_tasks(self.scheduled_tasks[session_id])
                 self.scheduled_tasks[session_id] = []
                 
                 # Also clear the active plan for this session
-                if session_id in self.active_plans:
-                    plan_name = self.active_plans[session_id]
-                    del self.active_plans[session_id]
-                    
-                    # Plan usage is now calculated in real-time by scanning active_plans
+                self._clear_active_plan(session_id)
         else:
             # Clear all tasks for all sessions
-            for session_tasks in self.scheduled_tasks.values():
-                count += len(session_tasks)
+            count = self._total_tasks
+            self._schedule_heap = []
+            self._live_tasks.clear()
             for session_id in self.scheduled_tasks:
                 self.scheduled_tasks[session_id] = []
                 
                 # Clear all active plans
-                if session_id in self.active_plans:
-                    plan_name = self.active_plans[session_id]
-                    del self.active_plans[session_id]
-                    
-                    # Plan usage is now calculated in real-time by scanning active_plans
+                self._clear_active_plan(session_id)
             
+        self._total_tasks -= count
+        
         # Stop scheduler if no tasks remain
-        total_tasks = sum(len(tasks) for tasks in self.scheduled_tasks.values())
-        if total_tasks == 0:
-            self.scheduler_running = False
+        if self._total_tasks == 0:
+            self.stop_scheduler()
             
         return count
     
@@ -641,183 +854,239 @@ class TaskScheduler:
         
         # Remove the task at the specified index
         deleted_task = tasks.pop(task_index)
+        self._total_tasks -= 1
+        self._unregister_tasks((deleted_task,))
         
         # Stop scheduler if no tasks remain
-        total_tasks = sum(len(tasks) for tasks in self.scheduled_tasks.values())
-        if total_tasks == 0:
-            self.scheduler_running = False
+        if self._total_tasks == 0:
+            self.stop_scheduler()
         
         return True, f"Deleted task: {deleted_task['message'][:50]}..."
     
+    def _load_plans(self):
+        """Get the in-memory saved task plans, re-parsing only when the plans file changes on disk
+        
+        The returned dict is the authoritative copy: callers mutate it and call _flush_plans().
+        """
+        try:
+            mtime = os.stat(TASK_PLANS_PATH).st_mtime_ns
+        except FileNotFoundError:
+            # Already seeded but the file could not be written (e.g. read-only config mount)
+            if self._plans_cache is not None and self._plans_mtime is None:
+                return self._plans_cache
+            # Plans used to live in config.json - seed the dedicated file from there once
+            self._plans_cache = dict(get_config("task_plans", {}))
+            self._plans_mtime = None  # In-memory only until a flush succeeds
+            self._plan_summary_cache = {}
+            if self._plans_cache:
+                self._normalize_plans(self._plans_cache)
+                try:
+                    self._flush_plans()
+                    logger.info(f"Migrated {len(self._plans_cache)} task plans from config.json to task_plans.json")
+                except Exception as e:
+                    # Keep serving the seeded plans from memory; the file is written on the next save
+                    logger.warning(f"Failed to write task_plans.json, using plans from config.json: {e}")
+            return self._plans_cache
+        
+        if self._plans_cache is None or mtime != self._plans_mtime:
+            self._plans_cache = self._read_plans_file()
+            self._plans_mtime = mtime
+            self._plan_summary_cache = {}
+            if self._normalize_plans(self._plans_cache):
+                try:
+                    self._flush_plans()
+                except Exception as e:
+                    # The in-memory copy is already normalized; the file is rewritten on the next save
+                    logger.warning(f"Failed to persist normalized task plans: {e}")
+        return self._plans_cache
+    
+    def _normalize_plans(self, plans):
+        """Convert old-format plans (tasks per session) to the flat task list in place
+        
+        Returns True if any plan was converted.
+        """
+        converted = False
+        for plan_name, plan_data in plans.items():
+            if "tasks" in plan_data or "sessions" not in plan_data:
+                continue
+            # Collect all unique tasks from all sessions, keeping first occurrence order
+            unique_tasks = dict.fromkeys(
+                (task["message"], task["schedule_spec"])
+                for session_tasks in plan_data["sessions"].values()
+                for task in session_tasks
+            )
+            # Build a new dict rather than mutating one that may be shared with the config cache
+            normalized = {key: value for key, value in plan_data.items() if key != "sessions"}
+            normalized["tasks"] = [
+                {"message": message, "schedule_spec": schedule_spec}
+                for message, schedule_spec in unique_tasks
+            ]
+            plans[plan_name] = normalized
+            converted = True
+        return converted
+    
+    def _read_plans_file(self):
+        """Parse task_plans.json straight from a read-only memory map (no intermediate copy)"""
+        with open(TASK_PLANS_PATH, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return {}
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return json_loads(view)
+    
+    def _flush_plans(self):
+        """Persist the in-memory plans to task_plans.json and mark the cache as current"""
+        # Serialize up front so the file gets a single write instead of one per token
+        self._write_plans(json_dumps(self._plans_cache, indent=_PRETTY_TASK_PLANS))
+        self._plans_mtime = os.stat(TASK_PLANS_PATH).st_mtime_ns
+    
+    def _write_plans(self, data: bytes):
+        """Atomically replace task_plans.json with already-serialized data"""
+        # Write to a temp file and rename so a crash mid-write never leaves a truncated file.
+        # The rename is what makes the swap atomic, so the write is left to the OS to buffer (no fsync)
+        with open(_TASK_PLANS_TMP_PATH, "wb") as f:
+            f.write(data)
+        os.replace(_TASK_PLANS_TMP_PATH, TASK_PLANS_PATH)
+    
+    def _summarize_plan(self, plan_data):
+        """Compute the listing summary (creation time and task count) for a plan"""
+        # Old-format plans are normalized to a flat task list when the plans file is read
+        return {
+            "created_at": plan_data.get("created_at", "Unknown"),
+            "task_count": len(plan_data.get("tasks", ()))
+        }
+    
     def save_task_plan(self, plan_name: str = None, session_id: str = None):
-        """Save scheduled tasks as a plan to config.json"""
-        import json
-        from datetime import datetime
+        """Save scheduled tasks as a plan to task_plans.json"""
+        saved_at = datetime.now()
         
         # Generate plan name if not provided
         if not plan_name:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = saved_at.strftime("%Y%m%d_%H%M%S")
             plan_name = f"task_plan_{timestamp}"
         
         # Collect tasks from specified session or all sessions
-        all_tasks = []
-        seen_tasks = set()  # To avoid duplicates
-        
         if session_id:
             # Save tasks from specific session only
-            if session_id in self.scheduled_tasks:
-                for task in self.scheduled_tasks[session_id]:
-                    task_data = {
-                        "message": task["message"],
-                        "schedule_spec": task["schedule_spec"]
-                    }
-                    all_tasks.append(task_data)
+            all_tasks = [
+                {"message": task["message"], "schedule_spec": task["schedule_spec"]}
+                for task in self.scheduled_tasks.get(session_id, ())
+            ]
         else:
-            # Save tasks from all sessions (legacy behavior)
-            for session_id, tasks in self.scheduled_tasks.items():
-                for task in tasks:
-                    # Create a unique key for the task to avoid duplicates
-                    task_key = (task["message"], task["schedule_spec"])
-                    if task_key not in seen_tasks:
-                        seen_tasks.add(task_key)
-                        task_data = {
-                            "message": task["message"],
-                            "schedule_spec": task["schedule_spec"]
-                        }
-                        all_tasks.append(task_data)
+            # Save tasks from all sessions (legacy behavior) - a dict drops duplicates in one pass
+            # while keeping first-occurrence order
+            unique_tasks = dict.fromkeys(
+                (task["message"], task["schedule_spec"])
+                for tasks in self.scheduled_tasks.values()
+                for task in tasks
+            )
+            all_tasks = [
+                {"message": message, "schedule_spec": schedule_spec}
+                for message, schedule_spec in unique_tasks
+            ]
+        
+        plans = self._load_plans()
+        
+        # Skip the rewrite entirely when the stored plan already has exactly these tasks
+        existing_plan = plans.get(plan_name)
+        if existing_plan is not None and existing_plan.get("tasks") == all_tasks:
+            return True, f"Task plan '{plan_name}' is already up to date"
         
         # Create plan data without session IDs
         plan_data = {
             "name": plan_name,
-            "created_at": datetime.now().isoformat(),
+            "created_at": saved_at.isoformat(timespec="seconds"),
             "tasks": all_tasks
         }
         
-        # Load current config
-        try:
-            with open("config/config.json", "r") as f:
-                config = json.load(f)
-        except FileNotFoundError:
-            config = {}
-        
-        # Add task_plans section if it doesn't exist
-        if "task_plans" not in config:
-            config["task_plans"] = {}
+        # Add/replace this plan
+        plans[plan_name] = plan_data
         
-        # Save the plan
-        config["task_plans"][plan_name] = plan_data
-        
-        # Write back to config.json
+        # Write back to task_plans.json - only plans are rewritten, never the rest of the config
         try:
-            with open("config/config.json", "w") as f:
-                json.dump(config, f, indent=2)
-            return True, f"Task plan '{plan_name}' saved successfully"
+            self._flush_plans()
         except Exception as e:
+            # Force the next read to re-parse what is actually on disk
+            self._plans_cache = None
             return False, f"Failed to save task plan: {str(e)}"
+        
+        # The cached plans now match the file, so only the saved plan's summary changes
+        self._plan_summary_cache[plan_name] = self._summarize_plan(plan_data)
+        return True, f"Task plan '{plan_name}' saved successfully"
     
     def load_task_plan(self, plan_name: str, target_session_id: str = None):
-        """Load a saved task plan from config.json and apply it to target session"""
-        import json
-        
-        try:
-            with open("config/config.json", "r") as f:
-                config = json.load(f)
-        except FileNotFoundError:
-            return False, "Config file not found"
-        
-        if "task_plans" not in config or plan_name not in config["task_plans"]:
+        """Load a saved task plan from task_plans.json and apply it to target session"""
+        plan_data = self._load_plans().get(plan_name)
+        if plan_data is None:
             return False, f"Task plan '{plan_name}' not found"
         
-        plan_data = config["task_plans"][plan_name]
-        loaded_tasks = 0
-        
-        # Clear existing tasks for the target session first
-        if target_session_id:
-            if target_session_id in self.scheduled_tasks:
-                self.scheduled_tasks[target_session_id] = []
-        
-        # Handle both old format (with sessions) and new format (just tasks)
-        if "tasks" in plan_data:
-            # New format - just a list of tasks
-            tasks = plan_data["tasks"]
-        elif "sessions" in plan_data:
-            # Old format - extract tasks from first session
-            # Collect all unique tasks from all sessions
-            all_tasks = []
-            seen_tasks = set()
-            for session_id, session_tasks in plan_data["sessions"].items():
-                for task in session_tasks:
-                    task_key = (task["message"], task["schedule_spec"])
-                    if task_key not in seen_tasks:
-                        seen_tasks.add(task_key)
-                        all_tasks.append(task)
-            tasks = all_tasks
-        else:
+        # Reject bad requests before touching the session's current tasks
+        if not target_session_id:
+            return False, "No target session specified"
+        
+        # Old-format plans (tasks per session) were already normalized when the plans file was read
+        tasks = plan_data.get("tasks")
+        if tasks is None:
             return False, f"Invalid plan format for '{plan_name}'"
         
-        # Load tasks to the target session
-        if target_session_id:
-            for task in tasks:
-                success, message = self.schedule_task(
-                    target_session_id, 
-                    task["message"], 
-                    task["schedule_spec"]
-                )
-                if success:
-                    loaded_tasks += 1
-        else:
-            return False, "No target session specified"
+        # Build the new task list first, then swap it in for the session's existing tasks
+        new_tasks = self._build_scheduled_tasks(target_session_id, tasks)
+        old_tasks = self.scheduled_tasks.get(target_session_id, ())
+        self.scheduled_tasks[target_session_id] = new_tasks
+        self._total_tasks += len(new_tasks) - len(old_tasks)
+        self._unregister_tasks(old_tasks)
+        self._register_tasks(new_tasks)
+        loaded_tasks = len(new_tasks)
         
         # Set the active plan for the target session
-        if target_session_id:
-            self.active_plans[target_session_id] = plan_name
-            
-            # Plan usage is now calculated in real-time by scanning active_plans
+        self._set_active_plan(target_session_id, plan_name)
         
-        return True, f"Loaded {loaded_tasks} tasks from plan '{plan_name}' to session {target_session_id or 'original sessions'}"
+        return True, f"Loaded {loaded_tasks} tasks from plan '{plan_name}' to session {target_session_id}"
+    
+    def _get_plan_summary(self, plan_name, plan_data):
+        """Get a plan's listing summary, computing it once per plan until the plans file changes"""
+        summary = self._plan_summary_cache.get(plan_name)
+        if summary is None:
+            summary = self._plan_summary_cache[plan_name] = self._summarize_plan(plan_data)
+        return summary
     
     def get_saved_task_plans(self):
-        """Get list of all saved task plans from config.json"""
-        import json
-        
-        try:
-            with open("config/config.json", "r") as f:
-                config = json.load(f)
-        except FileNotFoundError:
-            return []
-        
-        if "task_plans" not in config:
-            return []
+        """Get list of all saved task plans from task_plans.json"""
+        # Bind the per-plan lookups once instead of resolving them on every iteration
+        get_summary = self._get_plan_summary
+        get_usage_count = self.plan_usage_count.get
         
         plans = []
-        for plan_name, plan_data in config["task_plans"].items():
-            # Handle both old format (with sessions) and new format (just tasks)
-            if "tasks" in plan_data:
-                # New format
-                total_tasks = len(plan_data["tasks"])
-            elif "sessions" in plan_data:
-                # Old format - count unique tasks
-                seen_tasks = set()
-                for session_tasks in plan_data["sessions"].values():
-                    for task in session_tasks:
-                        task_key = (task["message"], task["schedule_spec"])
-                        seen_tasks.add(task_key)
-                total_tasks = len(seen_tasks)
-            else:
-                total_tasks = 0
-            
-            # Count how many sessions are currently using this plan by scanning active_plans
-            usage_count = sum(1 for active_plan in self.active_plans.values() if active_plan == plan_name)
-            
+        for plan_name, plan_data in self._load_plans().items():
+            summary = get_summary(plan_name, plan_data)
             plans.append({
                 "name": plan_name,
-                "created_at": plan_data.get("created_at", "Unknown"),
-                "session_count": usage_count,
-                "task_count": total_tasks
+                "created_at": summary["created_at"],
+                # Number of sessions currently using this plan
+                "session_count": get_usage_count(plan_name, 0),
+                "task_count": summary["task_count"]
             })
-        
         return plans
     
+    def _set_active_plan(self, session_id: str, plan_name: str):
+        """Mark plan_name as the session's active plan and update usage counts"""
+        if self.active_plans.get(session_id) == plan_name:
+            return  # Reloading the same plan leaves the usage count unchanged
+        self._clear_active_plan(session_id)
+        self.active_plans[session_id] = plan_name
+        self.plan_usage_count[plan_name] = self.plan_usage_count.get(plan_name, 0) + 1
+    
+    def _clear_active_plan(self, session_id: str):
+        """Drop the session's active plan, if any, and update usage counts"""
+        plan_name = self.active_plans.pop(session_id, None)
+        if plan_name is None:
+            return
+        remaining = self.plan_usage_count[plan_name] - 1
+        if remaining:
+            self.plan_usage_count[plan_name] = remaining
+        else:
+            del self.plan_usage_count[plan_name]
+    
     def get_active_plan(self, session_id: str):
         """Get the active plan name for a specific session"""
         return self.active_plans.get(session_id)
\ No newline at end of file
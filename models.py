@@ -5,10 +5,68 @@ Data models and utility functions for the agent system
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional, Dict, Any
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import json
 import os
+import time
+from collections import deque
+from itertools import islice
+
+# JSON Backend - pick the fastest installed library at import time
+# json_loads accepts str or any bytes-like object; json_dumps always returns UTF-8 bytes
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def json_loads(data):
+        return orjson.loads(data)
+
+    def json_dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+except ImportError:
+    try:
+        import msgspec
+
+        JSON_BACKEND = "msgspec"
+        JSONDecodeError = msgspec.DecodeError
+        _msgspec_encoder = msgspec.json.Encoder()
+        _msgspec_decoder = msgspec.json.Decoder()
+
+        def json_loads(data):
+            return _msgspec_decoder.decode(data)
+
+        def json_dumps(obj, indent: bool = False) -> bytes:
+            data = _msgspec_encoder.encode(obj)
+            return msgspec.json.format(data, indent=2) if indent else data
+    except ImportError:
+        try:
+            import ujson
+
+            JSON_BACKEND = "ujson"
+            JSONDecodeError = ujson.JSONDecodeError
+
+            def json_loads(data):
+                return ujson.loads(data if isinstance(data, (str, bytes)) else bytes(data))
+
+            def json_dumps(obj, indent: bool = False) -> bytes:
+                return ujson.dumps(obj, indent=2 if indent else 0, ensure_ascii=False).encode("utf-8")
+        except ImportError:
+            JSON_BACKEND = "json"
+            JSONDecodeError = json.JSONDecodeError
+
+            def json_loads(data):
+                return json.loads(data if isinstance(data, (str, bytes)) else bytes(data))
+
+            def json_dumps(obj, indent: bool = False) -> bytes:
+                if indent:
+                    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+                return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
 
 # Pydantic Models
 class ChatMessage(BaseModel):
@@ -27,13 +85,49 @@ class ScheduledTask(BaseModel):
     last_run: Optional[datetime] = None
     is_running: bool = False
 
+class ChatHistory:
+    """Bounded per-session message history
+    
+    Old messages rotate out once maxlen is reached; `total` keeps counting every message
+    ever added so pollers can still tell which messages are new. Messages can only be
+    added through append(), so the counter can't be bypassed.
+    """
+    
+    def __init__(self, maxlen: int = None):
+        self._messages = deque(maxlen=maxlen)
+        self._total = 0
+    
+    @property
+    def total(self) -> int:
+        """Number of messages ever appended, including ones that have rotated out"""
+        return self._total
+    
+    def append(self, message: ChatMessage):
+        self._messages.append(message)
+        self._total += 1
+    
+    def since(self, total: int) -> list:
+        """Get the retained messages added after the history's total was `total`"""
+        new_count = self._total - total
+        if new_count <= 0:
+            return []
+        messages = self._messages
+        return list(islice(messages, max(len(messages) - new_count, 0), None))
+    
+    def __iter__(self):
+        return iter(self._messages)
+    
+    def __len__(self):
+        return len(self._messages)
+
 # Logging Utilities
+# Source prefixes stripped from log messages (each ends at its first ']')
+_LOG_PREFIXES = ('[USER]', '[AI]', '[API]', '[TASK]', '[AGENT]', '[DEBUG]', '[WEB]', '[WARN]', '[ERROR]', '[MONITOR]')
+
 class CustomFormatter(logging.Formatter):
     def format(self, record):
-        # Get timestamp with explicit zero-padding
-        import datetime
-        dt = datetime.datetime.fromtimestamp(record.created)
-        timestamp = dt.strftime('%Y-%m-%d %H:%M:%S')
+        # Get timestamp with explicit zero-padding (C-level strftime, no datetime object per record)
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.created))
         
         # Ensure we have the message attribute
         if not hasattr(record, 'message'):
@@ -41,29 +135,40 @@ class CustomFormatter(logging.Formatter):
             
         msg = record.message
         
-        # Remove any existing prefixes from the message
-        prefixes = ['[USER]', '[AI]', '[API]', '[TASK]', '[AGENT]', '[DEBUG]', '[WEB]', '[WARN]', '[ERROR]', '[MONITOR]']
-        for prefix in prefixes:
-            if msg.startswith(prefix):
-                msg = msg[len(prefix):].strip()
-                break
+        # Remove any existing prefix from the message (one C-level tuple check)
+        if msg.startswith(_LOG_PREFIXES):
+            msg = msg[msg.index(']') + 1:].strip()
         
         # Return just timestamp and clean message
         return f'[{timestamp}] {msg}'
 
+_log_listener = None
+
 def setup_logging():
-    """Configure logging for the agent system"""
+    """Configure logging for the agent system
+    
+    Records are handed to a queue and written to stdout by a background listener thread,
+    so callers on the event loop never block on console I/O.
+    """
+    global _log_listener
     logger = logging.getLogger("agent")
     logger.setLevel(logging.DEBUG)  # Enable debug logging to see monitor messages
     
-    # Remove default handlers
+    # Remove default handlers (and stop the writer thread from a previous setup)
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+    if _log_listener is not None:
+        _log_listener.stop()
     
-    # Console handler with custom formatter
+    # Records are formatted by the caller with the custom formatter; the listener only writes them
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(CustomFormatter('%(levelname)s %(message)s'))
+    logger.addHandler(queue_handler)
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(CustomFormatter('%(levelname)s %(message)s'))
-    logger.addHandler(console_handler)
+    console_handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = logging.handlers.QueueListener(log_queue, console_handler)
+    _log_listener.start()
     
     # Suppress uvicorn access logs and startup/shutdown messages
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
@@ -72,8 +177,17 @@ def setup_logging():
     
     return logger
 
+def _stop_log_listener():
+    """Flush queued log records on interpreter exit"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+atexit.register(_stop_log_listener)
+
 # Configuration Management
 _config_cache = None
+_config_lookup_cache: Dict[str, Any] = {}  # key_path -> resolved value (or _CONFIG_KEY_MISSING)
+_CONFIG_KEY_MISSING = object()
 
 def load_config(config_path: str = "config/config.json") -> Dict[str, Any]:
     """Load configuration from JSON file with caching"""
@@ -86,10 +200,12 @@ def load_config(config_path: str = "config/config.json") -> Dict[str, Any]:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
     try:
-        with open(config_path, 'r') as f:
-            _config_cache = json.load(f)
+        # Read the whole file once and parse the bytes with the fast JSON backend
+        with open(config_path, 'rb') as f:
+            _config_cache = json_loads(f.read())
+        _config_lookup_cache.clear()
         return _config_cache
-    except json.JSONDecodeError as e:
+    except JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in configuration file: {e}")
     except Exception as e:
         raise RuntimeError(f"Error loading configuration: {e}")
@@ -98,17 +214,22 @@ def get_config(key_path: str, default: Any = None) -> Any:
     """Get configuration value using dot notation (e.g., 'server.host')"""
     config = load_config()
     
-    keys = key_path.split('.')
-    value = config
+    # Each dotted path is split and walked once; later lookups are a single dict hit
+    value = _config_lookup_cache.get(key_path, _CONFIG_KEY_MISSING)
+    if value is _CONFIG_KEY_MISSING and key_path not in _config_lookup_cache:
+        value = config
+        try:
+            for key in key_path.split('.'):
+                value = value[key]
+        except (KeyError, TypeError):
+            value = _CONFIG_KEY_MISSING
+        _config_lookup_cache[key_path] = value
     
-    try:
-        for key in keys:
-            value = value[key]
-        return value
-    except (KeyError, TypeError):
+    if value is _CONFIG_KEY_MISSING:
         if default is not None:
             return default
         raise KeyError(f"Configuration key not found: {key_path}")
+    return value
 
 # Global debug mode flag
 DEBUG_MODE = False
\ No newline at end of file
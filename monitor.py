@@ -7,8 +7,9 @@ to proceed when no tool calls are detected in the response.
 
 import re
 import logging
-from typing import Set
-from models import get_config
+from datetime import datetime
+from typing import Set, Tuple
+from models import ChatMessage, get_config
 
 logger = logging.getLogger("agent")
 
@@ -19,7 +20,19 @@ class TaskMonitor:
         self.monitored_sessions: Set[str] = set()
         self.monitoring_enabled = get_config("monitoring.enabled", True)
         self.tool_pattern = re.compile(r'^/tool\s+', re.MULTILINE | re.IGNORECASE)
+        self._tool_line_re = re.compile(r'^[^\S\n]*(/tool[^\n]*)(?:\n(?=([^\n]*)))?', re.MULTILINE)
+        self._tool_error_re = re.compile(r'skipping|unknown tool|error:|failed', re.IGNORECASE)
         self.auto_prompt_counts = {}  # Track auto-prompt count per task execution
+        self._last_tool_response = None  # Single-entry cache of the last has_tool_calls scan
+        self._last_tool_result = False
+        self.refresh_config()
+    
+    def refresh_config(self):
+        """Re-read the monitoring settings used on every response check"""
+        self._min_length = get_config("monitoring.min_response_length", 10)
+        self._truncate_len = get_config("limits.message_truncation_length", 16)
+        self._max_prompts = get_config("monitoring.max_auto_prompts_per_task", 3)
+        self._proceed_prompt = get_config("monitoring.auto_proceed_prompt", "please proceed")
         
     def enable_monitoring(self, session_id: str):
         """Enable monitoring for a specific session"""
@@ -40,32 +53,35 @@ class TaskMonitor:
         if not response or not isinstance(response, str):
             return False
         
-        # Split response into lines and check each line
-        lines = response.split('\n')
+        # Follow-ups often repeat the same text; skip the rescan (== is identity/length-first, then memcmp)
+        if response == self._last_tool_response:
+            return self._last_tool_result
         
-        for i, line in enumerate(lines):
-            # Check if line starts with /tool (after stripping whitespace)
-            clean_line = line.strip()
-            if clean_line.startswith('/tool'):
-                # Check if this line or next line contains error indicators
-                # that suggest the tool call failed
-                error_indicators = ['skipping', 'unknown tool', 'error:', 'failed']
-                
-                # Check current line for errors
-                line_lower = line.lower()
-                if any(indicator in line_lower for indicator in error_indicators):
-                    logger.info(f"Found failed tool call: {clean_line[:50]}...")
-                    continue
-                
-                # Check next line for error messages (if exists)
-                if i + 1 < len(lines):
-                    next_line_lower = lines[i + 1].lower()
-                    if any(indicator in next_line_lower for indicator in error_indicators):
-                        logger.info(f"Found failed tool call (error on next line): {clean_line[:50]}...")
-                        continue
-                
-                logger.info(f"Found successful tool call: {clean_line[:50]}...")
-                return True
+        result = self._scan_tool_calls(response)
+        self._last_tool_response = response
+        self._last_tool_result = result
+        return result
+    
+    def _scan_tool_calls(self, response: str) -> bool:
+        """Scan response for a /tool line without error indicators on it or the line after"""
+        # One scan over the response: each match is a /tool line plus a lookahead capture
+        # of the line after it (not consumed, so a following /tool line still matches)
+        for match in self._tool_line_re.finditer(response):
+            clean_line = match.group(1).rstrip()
+            
+            # Check current line for error indicators that suggest the tool call failed
+            if self._tool_error_re.search(clean_line):
+                logger.info(f"Found failed tool call: {clean_line[:50]}...")
+                continue
+            
+            # Check next line for error messages (if exists)
+            next_line = match.group(2)
+            if next_line and self._tool_error_re.search(next_line):
+                logger.info(f"Found failed tool call (error on next line): {clean_line[:50]}...")
+                continue
+            
+            logger.info(f"Found successful tool call: {clean_line[:50]}...")
+            return True
         
         return False
     
@@ -75,8 +91,7 @@ class TaskMonitor:
             return False
         
         # Don't prompt if response is empty or too short
-        min_length = get_config("monitoring.min_response_length", 10)
-        if not response or len(response.strip()) < min_length:
+        if not response or len(response.strip()) < self._min_length:
             return False
         
         # Don't prompt if response contains tool calls
@@ -87,16 +102,14 @@ class TaskMonitor:
         logger.info("Response needs auto-prompting - no tool calls detected")
         return True
     
-    def get_task_key(self, session_id: str, task_message: str) -> str:
+    def get_task_key(self, session_id: str, task_message: str) -> Tuple[str, str]:
         """Generate unique key for task execution"""
-        import hashlib
-        return f"{session_id}:{hashlib.md5(task_message.encode()).hexdigest()[:8]}"
+        # Plain tuple key: str hashes are cached, so no digest is needed and keys never collide
+        return (session_id, task_message)
     
     def reset_task_counter(self, session_id: str, task_message: str):
         """Reset auto-prompt counter for a new scheduled task execution"""
-        task_key = self.get_task_key(session_id, task_message)
-        if task_key in self.auto_prompt_counts:
-            del self.auto_prompt_counts[task_key]
+        self.auto_prompt_counts.pop(self.get_task_key(session_id, task_message), None)
     
     async def monitor_scheduled_response(self, session_id: str, task_message: str, response: str, scheduler_ref=None) -> bool:
         """
@@ -117,131 +130,60 @@ class TaskMonitor:
         # Reset counter for new scheduled task execution
         self.reset_task_counter(session_id, task_message)
         
-        truncate_len = get_config("limits.message_truncation_length", 16)
-        
-        if self.needs_prompting(response):
-            # Check if we've exceeded max auto-prompts for this task
-            task_key = self.get_task_key(session_id, task_message)
-            current_count = self.auto_prompt_counts.get(task_key, 0)
-            max_prompts = get_config("monitoring.max_auto_prompts_per_task", 3)
-            
-            if current_count >= max_prompts:
-                logger.info(f"Max auto-prompts ({max_prompts}) reached for task {task_key}")
-                return False
-            
-            logger.info(f"Injecting 'please proceed' for session {session_id} (attempt {current_count + 1}/{max_prompts})")
-            
-            if scheduler_ref and hasattr(scheduler_ref, 'send_message_to_session'):
-                try:
-                    proceed_prompt = get_config("monitoring.auto_proceed_prompt", "please proceed")
-                    
-                    # Increment counter
-                    self.auto_prompt_counts[task_key] = current_count + 1
-                    
-                    # Show auto prompt on web immediately
-                    if hasattr(scheduler_ref, 'chat_manager_ref') and scheduler_ref.chat_manager_ref:
-                        from models import ChatMessage
-                        from datetime import datetime
-                        
-                        auto_prompt_msg = ChatMessage(
-                            message=f"[AUTO] {proceed_prompt} ({self.auto_prompt_counts[task_key]}/{max_prompts})",
-                            timestamp=datetime.now().isoformat(),
-                            sender="system"
-                        )
-                        # Store auto-prompt message directly in chat history
-                        if session_id not in scheduler_ref.chat_manager_ref.chat_history:
-                            scheduler_ref.chat_manager_ref.chat_history[session_id] = []
-                        scheduler_ref.chat_manager_ref.chat_history[session_id].append(auto_prompt_msg)
-                    
-                    # Send prompt to AI and get response
-                    follow_up_response = await scheduler_ref.send_message_to_session(session_id, proceed_prompt)
-                    
-                    # Broadcast AI's follow-up response
-                    if hasattr(scheduler_ref, 'chat_manager_ref') and scheduler_ref.chat_manager_ref:
-                        ai_response_msg = ChatMessage(
-                            message=follow_up_response,
-                            timestamp=datetime.now().isoformat(),
-                            sender="assistant"
-                        )
-                        # Store AI response directly in chat history
-                        scheduler_ref.chat_manager_ref.chat_history[session_id].append(ai_response_msg)
-                    
-                    logger.info(f"Follow-up sent for session {session_id}: {follow_up_response[:truncate_len]}...")
-                    
-                    # Monitor the follow-up response for additional auto-prompts (without re-broadcasting original task)
-                    await self._monitor_follow_up_response(session_id, task_message, follow_up_response, scheduler_ref)
-                    
-                    return True
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send follow-up for session {session_id}: {e}")
-                    return False
+        if not scheduler_ref or not hasattr(scheduler_ref, 'send_message_to_session'):
+            return False
         
-        return False
-    
-    async def _monitor_follow_up_response(self, session_id: str, task_message: str, response: str, scheduler_ref=None) -> bool:
-        """Monitor a follow-up response without re-broadcasting the original scheduled task"""
-        truncate_len = get_config("limits.message_truncation_length", 16)
+        truncate_len = self._truncate_len
+        max_prompts = self._max_prompts
+        proceed_prompt = self._proceed_prompt
+        task_key = self.get_task_key(session_id, task_message)
+        follow_up_sent = False
         
-        if self.needs_prompting(response):
+        # Keep prompting while follow-up responses still need it (without re-broadcasting original task)
+        while self.needs_prompting(response):
             # Check if we've exceeded max auto-prompts for this task
-            task_key = self.get_task_key(session_id, task_message)
             current_count = self.auto_prompt_counts.get(task_key, 0)
-            max_prompts = get_config("monitoring.max_auto_prompts_per_task", 3)
-            
             if current_count >= max_prompts:
                 logger.info(f"Max auto-prompts ({max_prompts}) reached for task {task_key}")
-                return False
+                break
             
             logger.info(f"Injecting 'please proceed' for session {session_id} (attempt {current_count + 1}/{max_prompts})")
             
-            if scheduler_ref and hasattr(scheduler_ref, 'send_message_to_session'):
-                try:
-                    proceed_prompt = get_config("monitoring.auto_proceed_prompt", "please proceed")
-                    
-                    # Increment counter
-                    self.auto_prompt_counts[task_key] = current_count + 1
-                    
-                    # Show auto prompt on web immediately
-                    if hasattr(scheduler_ref, 'chat_manager_ref') and scheduler_ref.chat_manager_ref:
-                        from models import ChatMessage
-                        from datetime import datetime
-                        
-                        auto_prompt_msg = ChatMessage(
-                            message=f"[AUTO] {proceed_prompt} ({self.auto_prompt_counts[task_key]}/{max_prompts})",
-                            timestamp=datetime.now().isoformat(),
-                            sender="system"
-                        )
-                        # Store auto-prompt message directly in chat history
-                        if session_id not in scheduler_ref.chat_manager_ref.chat_history:
-                            scheduler_ref.chat_manager_ref.chat_history[session_id] = []
-                        scheduler_ref.chat_manager_ref.chat_history[session_id].append(auto_prompt_msg)
-                    
-                    # Send prompt to AI and get response
-                    follow_up_response = await scheduler_ref.send_message_to_session(session_id, proceed_prompt)
-                    
-                    # Broadcast AI's follow-up response
-                    if hasattr(scheduler_ref, 'chat_manager_ref') and scheduler_ref.chat_manager_ref:
-                        ai_response_msg = ChatMessage(
-                            message=follow_up_response,
-                            timestamp=datetime.now().isoformat(),
-                            sender="assistant"
-                        )
-                        # Store AI response directly in chat history
-                        scheduler_ref.chat_manager_ref.chat_history[session_id].append(ai_response_msg)
-                    
-                    logger.info(f"Follow-up sent for session {session_id}: {follow_up_response[:truncate_len]}...")
-                    
-                    # Continue monitoring follow-up responses recursively
-                    await self._monitor_follow_up_response(session_id, task_message, follow_up_response, scheduler_ref)
-                    
-                    return True
-                    
-                except Exception as e:
-                    logger.error(f"Failed to send follow-up for session {session_id}: {e}")
-                    return False
+            try:
+                # Increment counter
+                self.auto_prompt_counts[task_key] = current_count + 1
+                
+                # Show auto prompt on web immediately
+                if hasattr(scheduler_ref, 'chat_manager_ref') and scheduler_ref.chat_manager_ref:
+                    auto_prompt_msg = ChatMessage(
+                        message=f"[AUTO] {proceed_prompt} ({self.auto_prompt_counts[task_key]}/{max_prompts})",
+                        timestamp=datetime.now().isoformat(),
+                        sender="system"
+                    )
+                    # Store auto-prompt message directly in chat history
+                    scheduler_ref.chat_manager_ref.get_history(session_id).append(auto_prompt_msg)
+                
+                # Send prompt to AI and get response
+                response = await scheduler_ref.send_message_to_session(session_id, proceed_prompt)
+                
+                # Broadcast AI's follow-up response
+                if hasattr(scheduler_ref, 'chat_manager_ref') and scheduler_ref.chat_manager_ref:
+                    ai_response_msg = ChatMessage(
+                        message=response,
+                        timestamp=datetime.now().isoformat(),
+                        sender="assistant"
+                    )
+                    # Store AI response directly in chat history
+                    scheduler_ref.chat_manager_ref.get_history(session_id).append(ai_response_msg)
+                
+                logger.info(f"Follow-up sent for session {session_id}: {response[:truncate_len]}...")
+                follow_up_sent = True
+                
+            except Exception as e:
+                logger.error(f"Failed to send follow-up for session {session_id}: {e}")
+                break
         
-        return False
+        return follow_up_sent
     
     def get_monitoring_stats(self) -> dict:
         """Get monitoring statistics"""
@@ -254,6 +196,7 @@ class TaskMonitor:
     def set_global_monitoring(self, enabled: bool):
         """Enable or disable monitoring globally"""
         self.monitoring_enabled = enabled
+        self.refresh_config()
         logger.info(f"Global monitoring {'enabled' if enabled else 'disabled'}")
 
 # Global monitor instance
@@ -16,7 +16,7 @@ import logging
 import asyncio
 
 from core import TaskScheduler
-from models import ChatMessage, ScheduleRequest, get_config
+from models import ChatHistory, ChatMessage, ScheduleRequest, get_config
 from monitor import get_task_monitor
 
 logger = logging.getLogger("agent")
@@ -26,14 +26,22 @@ class ChatManager:
     
     def __init__(self, scheduler: TaskScheduler):
         self.scheduler = scheduler
-        self.chat_history: Dict[str, List[ChatMessage]] = {}  # agent_session_id -> [messages]
+        self.chat_history: Dict[str, ChatHistory] = {}  # agent_session_id -> [messages]
         self.web_session_agents: Dict[str, List[str]] = {}  # web_session_id -> [agent_session_ids]
+        # Keep only last N messages per session
+        self.max_history = get_config("limits.max_chat_history_per_session")
+    
+    def get_history(self, session_id: str) -> ChatHistory:
+        """Get a session's message history, creating it on first use"""
+        history = self.chat_history.get(session_id)
+        if history is None:
+            history = self.chat_history[session_id] = ChatHistory(maxlen=self.max_history)
+        return history
         
     def ensure_session(self, agent_session_id: str, web_session_id: str = None):
         """Ensure session exists and is properly initialized"""
         # Initialize chat history if it doesn't exist
-        if agent_session_id not in self.chat_history:
-            self.chat_history[agent_session_id] = []
+        self.get_history(agent_session_id)
         
         # If web_session_id provided, ensure this agent session is assigned to it
         if web_session_id:
@@ -44,18 +52,11 @@ class ChatManager:
         # Ensure session_id is always a string for consistent dictionary keys
         session_key = str(session_id)
         
-        # Store message in session history
-        if session_key not in self.chat_history:
-            self.chat_history[session_key] = []
-        
-        self.chat_history[session_key].append(message)
-        
-        # Keep only last N messages per session
-        max_history = get_config("limits.max_chat_history_per_session")
-        if len(self.chat_history[session_key]) > max_history:
-            self.chat_history[session_key] = self.chat_history[session_key][-max_history:]
+        # Store message in session history (bounded to the last N messages)
+        history = self.get_history(session_key)
+        history.append(message)
         
-        logger.info(f"Stored message for session '{session_key}'. Total messages: {len(self.chat_history[session_key])}")
+        logger.info(f"Stored message for session '{session_key}'. Total messages: {len(history)}")
     
 
     async def ask_ai(self, session_id: str, question: str, stream_callback=None) -> str:
@@ -77,9 +78,7 @@ class ChatManager:
             timestamp=datetime.now().isoformat()
         )
         
-        if session_id not in self.chat_history:
-            self.chat_history[session_id] = []
-        self.chat_history[session_id].append(user_msg)
+        self.get_history(session_id).append(user_msg)
         
         truncate_len = get_config("limits.message_truncation_length")
         logger.info(f"Scheduled message stored for session {session_id}: {message[:truncate_len]}...")
@@ -95,7 +94,7 @@ class ChatManager:
                     sender="assistant",
                     timestamp=datetime.now().isoformat()
                 )
-                self.chat_history[session_id].append(ai_msg)
+                self.get_history(session_id).append(ai_msg)
                 
                 logger.info(f"Scheduled AI response stored for session {session_id}: {response[:truncate_len]}...")
                 return response
@@ -111,7 +110,7 @@ class ChatManager:
                 timestamp=datetime.now().isoformat(),
                 sender="system"
             )
-            self.chat_history[session_id].append(error_msg)
+            self.get_history(session_id).append(error_msg)
             return f"Error: {str(e)}"
     
     def store_scheduled_question(self, session_id: str, question: str):
@@ -337,9 +336,7 @@ def create_app(scheduler: TaskScheduler, chat_manager: ChatManager) -> FastAPI:
             timestamp=datetime.now().isoformat()
         )
         
-        if session_id not in chat_manager.chat_history:
-            chat_manager.chat_history[session_id] = []
-        chat_manager.chat_history[session_id].append(user_msg)
+        chat_manager.get_history(session_id).append(user_msg)
         
         truncate_len = get_config("limits.message_truncation_length")
         logger.info(f"User message stored for session {session_id}: {message[:truncate_len]}...")
@@ -355,7 +352,7 @@ def create_app(scheduler: TaskScheduler, chat_manager: ChatManager) -> FastAPI:
                     sender="assistant",
                     timestamp=datetime.now().isoformat()
                 )
-                chat_manager.chat_history[session_id].append(ai_msg)
+                chat_manager.get_history(session_id).append(ai_msg)
                 
                 logger.info(f"AI response stored for session {session_id}: {response[:truncate_len]}...")
                 
@@ -377,7 +374,7 @@ def create_app(scheduler: TaskScheduler, chat_manager: ChatManager) -> FastAPI:
                 timestamp=datetime.now().isoformat(),
                 sender="system"
             )
-            chat_manager.chat_history[session_id].append(error_msg)
+            chat_manager.get_history(session_id).append(error_msg)
             
             return chat_manager.make_response_with_session({
                 "status": "error",
@@ -414,9 +411,9 @@ def create_app(scheduler: TaskScheduler, chat_manager: ChatManager) -> FastAPI:
         """Stream chat messages and scheduled tasks for a specific session via SSE"""
         
         async def event_stream():
-            # Start with current message count to avoid re-sending existing messages
-            current_messages = chat_manager.chat_history.get(session_id, [])
-            last_sent_message_count = len(current_messages)
+            # Start with current message total to avoid re-sending existing messages
+            history = chat_manager.chat_history.get(session_id)
+            last_sent_message_count = history.total if history is not None else 0
             
             while True:
                 try:
@@ -427,14 +424,14 @@ def create_app(scheduler: TaskScheduler, chat_manager: ChatManager) -> FastAPI:
                     tasks_data = {"type": "tasks", "data": tasks}
                     yield f"data: {json.dumps(tasks_data)}\n\n"
                     
-                    # Check for new messages
-                    current_messages = chat_manager.chat_history.get(session_id, [])
-                    current_count = len(current_messages)
+                    # Check for new messages (total keeps growing after old messages rotate out)
+                    history = chat_manager.chat_history.get(session_id)
+                    current_count = history.total if history is not None else 0
                     
                     if current_count > last_sent_message_count:
                         logger.info(f"SSE detected new messages for session {session_id}: {current_count} > {last_sent_message_count}")
                         # Send new messages since last check
-                        new_messages = current_messages[last_sent_message_count:]
+                        new_messages = history.since(last_sent_message_count)
                         messages_data = {"type": "messages", "data": [msg.__dict__ for msg in new_messages]}
                         yield f"data: {json.dumps(messages_data)}\n\n"
                         last_sent_message_count = current_count